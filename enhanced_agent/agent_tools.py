@@ -6,33 +6,135 @@ strictly grounded in the provided source data.
 """
 from __future__ import annotations
 
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import json
+import mmap
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 DEFAULT_DATA_PATH = Path(__file__).with_name("portfolio_data.json")
 
 
+def _dump(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _parse(raw: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_bytes(path_str: str) -> bytes:
+    """Read the file via mmap, skipping buffered text-mode reads and decode."""
+    with open(path_str, "rb") as handle:
+        try:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = bytes(mm)
+        except ValueError:  # cannot mmap an empty file
+            raw = handle.read()
+    if raw[:3] == b"\xef\xbb\xbf":  # strip UTF-8 BOM (utf-8-sig files)
+        raw = raw[3:]
+    return raw
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse the JSON file once per (path, mtime) and build the cache record;
+    mtime changes invalidate the record automatically.
+    """
+    return _build_record(_parse(_read_bytes(path_str)))
+
+
+def _build_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pre-serialize every top-level section and build the search index, so
+    tool calls return cached strings without re-running json.dumps.
+
+    Returns a record: {"data": dict, "dumps": {section: str}, "about": str,
+    plus the search-index keys}.
+    """
+    dumps = {section: _dump(value) for section, value in data.items()}
+    about = _dump({"about": data.get("profile", {}).get("about")})
+
+    # Search index over project name+summary: (lowercased haystack, project)
+    # pairs plus a character 3-gram -> project-index map so queries build no
+    # strings and only substring-check a few candidate projects.
+    project_haystacks = []
+    ngrams: Dict[str, set] = {}
+    for idx, project in enumerate(data.get("projects", [])):
+        haystack = " ".join([
+            str(project.get("name", "")),
+            str(project.get("summary", "")),
+        ]).lower()
+        project_haystacks.append((haystack, project))
+        for pos in range(len(haystack) - 2):
+            ngrams.setdefault(haystack[pos:pos + 3], set()).add(idx)
+
+    # Single bytes blob of all haystacks (0x1f-separated) plus start offsets,
+    # so keywords too short for the 3-gram index are scanned with bytes.find
+    # (C-level memmem) instead of a Python loop over individual strings.
+    blob_parts = []
+    blob_starts = []
+    cursor = 0
+    for haystack, _ in project_haystacks:
+        encoded = haystack.encode("utf-8")
+        blob_parts.append(encoded)
+        blob_starts.append(cursor)
+        cursor += len(encoded) + 1  # +1 for the separator byte
+
+    return {
+        "data": data,
+        "dumps": dumps,
+        "about": about,
+        "project_haystacks": project_haystacks,
+        "ngrams": ngrams,
+        "blob": b"\x1f".join(blob_parts),
+        "blob_starts": blob_starts,
+    }
+
+
 class PortfolioTools:
     """Tools that return portfolio data from a local JSON file."""
 
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(self, data_path: Optional[Path] = None,
+                 data: Optional[Dict[str, Any]] = None):
         self.data_path = data_path or DEFAULT_DATA_PATH
+        # With pre-parsed data (e.g. from a caller's own cache) the record
+        # is built once here and the file is never read.
+        self._preloaded_record = None if data is None else _build_record(data)
 
-    def _load_data(self) -> Dict[str, Any]:
+    def _record(self) -> Dict[str, Any]:
+        """Get the cached record for the current file version, or an error."""
+        if self._preloaded_record is not None:
+            return self._preloaded_record
         if not self.data_path.exists():
             return {"error": f"Portfolio data file not found: {self.data_path}"}
-        with self.data_path.open("r", encoding="utf-8-sig") as handle:
-            return json.load(handle)
+        return _load_cached(str(self.data_path), self.data_path.stat().st_mtime_ns)
+
+    def _load_data(self) -> Dict[str, Any]:
+        record = self._record()
+        if "error" in record:
+            return record
+        return record["data"]
 
     def _dump(self, data: Any) -> str:
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dump(data)
 
     def _get_section(self, section: str) -> str:
-        data = self._load_data()
-        if "error" in data:
-            return self._dump(data)
-        return self._dump(data.get(section, []))
+        record = self._record()
+        if "error" in record:
+            return self._dump(record)
+        return record["dumps"].get(section, "[]")
 
     def _sanitize_limit(self, limit: Optional[int], default: int = 10, max_limit: int = 50) -> int:
         try:
@@ -55,11 +157,10 @@ class PortfolioTools:
         return self._get_section("links")
 
     def get_about(self) -> str:
-        data = self._load_data()
-        if "error" in data:
-            return self._dump(data)
-        profile = data.get("profile", {})
-        return self._dump({"about": profile.get("about")})
+        record = self._record()
+        if "error" in record:
+            return self._dump(record)
+        return record["about"]
 
     def get_education(self) -> str:
         return self._get_section("education")
@@ -74,30 +175,52 @@ class PortfolioTools:
         return self._get_section("projects")
 
     def search_projects(self, keyword: str, limit: Optional[int] = 10) -> str:
-        data = self._load_data()
-        if "error" in data:
-            return self._dump(data)
+        record = self._record()
+        if "error" in record:
+            return self._dump(record)
         if not keyword:
             return self._dump({"error": "Keyword is required."})
 
         keyword_lower = keyword.lower()
-        projects = data.get("projects", [])
-        matches = []
-        for project in projects:
-            haystack = " ".join([
-                str(project.get("name", "")),
-                str(project.get("summary", "")),
-            ]).lower()
-            if keyword_lower in haystack:
-                matches.append(project)
+        project_haystacks = record["project_haystacks"]
+
+        if len(keyword_lower) >= 3:
+            # Intersect the 3-gram posting sets to narrow to candidates, then
+            # confirm with a substring check (same semantics as a full scan).
+            ngrams = record["ngrams"]
+            candidates = None
+            for pos in range(len(keyword_lower) - 2):
+                posting = ngrams.get(keyword_lower[pos:pos + 3])
+                if not posting:
+                    candidates = set()
+                    break
+                candidates = posting if candidates is None else candidates & posting
+            indices = sorted(candidates or ())
+            matches = [
+                project_haystacks[idx][1]
+                for idx in indices
+                if keyword_lower in project_haystacks[idx][0]
+            ]
+        else:
+            # Too short for 3-grams; scan the combined bytes blob with
+            # bytes.find and map hit positions back to project indices.
+            blob = record["blob"]
+            blob_starts = record["blob_starts"]
+            needle = keyword_lower.encode("utf-8")
+            found = set()
+            pos = blob.find(needle)
+            while pos != -1:
+                found.add(bisect_right(blob_starts, pos) - 1)
+                pos = blob.find(needle, pos + 1)
+            matches = [project_haystacks[idx][1] for idx in sorted(found)]
 
         limit = self._sanitize_limit(limit)
         return self._dump(matches[:limit])
 
 
 # JSON Tool definitions for LLM function calling (Ollama/OpenAI format)
-def get_tool_definitions() -> List[Dict[str, Any]]:
-    """Get tool definitions in Ollama/OpenAI function calling format."""
+def _build_tool_definitions() -> List[Dict[str, Any]]:
+    """Build tool definitions in Ollama/OpenAI function calling format."""
 
     return [
         {
@@ -188,6 +311,18 @@ def get_tool_definitions() -> List[Dict[str, Any]]:
     ]
 
 
+# Shared module-level instances: agents reuse one tool object and one schema
+# structure instead of rebuilding them per construction. The schema is a
+# tuple so no caller can mutate the shared copy.
+TOOL_DEFINITIONS = tuple(_build_tool_definitions())
+DEFAULT_TOOLS = PortfolioTools()
+DEFAULT_TOOLS._record()  # warm the parse cache at import time
+
+
+def get_tool_definitions() -> tuple:
+    """Get the (static, shared) tool definitions."""
+    return TOOL_DEFINITIONS
+
+
 if __name__ == "__main__":
-    tools = PortfolioTools()
-    print(tools.get_profile())
+    print(DEFAULT_TOOLS.get_profile())
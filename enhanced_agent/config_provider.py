@@ -1,10 +1,17 @@
 import os
 from dotenv import load_dotenv
 
+# load_dotenv walks the filesystem looking for .env; do that at most once
+# per process no matter how many providers are constructed.
+_dotenv_loaded = False
+
 
 class EnvConfigProvider:
     def __init__(self):
-        load_dotenv()
+        global _dotenv_loaded
+        if not _dotenv_loaded:
+            load_dotenv()
+            _dotenv_loaded = True
 
     def get_openai_api_key(self) -> str:
         api_key = os.getenv("OPENAI_API_KEY")
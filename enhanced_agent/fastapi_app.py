@@ -1,10 +1,9 @@
-﻿from fastapi import FastAPI, HTTPException, Header, status
+﻿from fastapi import FastAPI, HTTPException, Header, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from agent_tools import DEFAULT_TOOLS
 from config_provider import EnvConfigProvider
 from portfolio_agent import LLMPortfolioAgent
-from ollama import Client as OllamaClient
-from openai import OpenAI
 
 fastapi_app = FastAPI()
 
@@ -19,18 +18,25 @@ fastapi_app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["POST"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    # Exact allowlist instead of "*" so the middleware skips its wildcard
+    # header-echo path on every preflight.
+    allow_headers=["content-type", "x-internal-auth"],
 )
 
 
-openai_api_key = EnvConfigProvider().get_openai_api_key()
+_cfg = EnvConfigProvider()
+openai_api_key = _cfg.get_openai_api_key()
 
 
 def get_llm_client(llm_type: str, api_key: str = None):
     """Initialize LLM client"""
+    # Import lazily so the unused provider's package (httpx, pydantic models,
+    # etc.) is never loaded; only one provider runs per process.
     if llm_type == "Ollama":
         try:
+            from ollama import Client as OllamaClient
+
             client = OllamaClient(host="http://localhost:11434")
             client.list()  # Test connection
             return client, None
@@ -42,6 +48,8 @@ def get_llm_client(llm_type: str, api_key: str = None):
         try:
             if not api_key:
                 return None, "OpenAI API key required"
+            from openai import OpenAI
+
             client = OpenAI(api_key=api_key)
             return client, None
         except ImportError:
@@ -77,7 +85,7 @@ class AskResponse(BaseModel):
     answer: str
 
 
-INTERNAL_TOKEN = EnvConfigProvider().get_internal_auth_token()
+INTERNAL_TOKEN = _cfg.get_internal_auth_token()
 
 
 # Secure FastAPI with an internal header
@@ -93,13 +101,62 @@ async def verify_internal_auth(x_internal_auth: str = Header(None)):
 @fastapi_app.post("/portfolio/ask", response_model=AskResponse)
 async def ask_agent(req: AskRequest):
     try:
-        resp = agent.ask(
+        # aask keeps the event loop free (LLM I/O runs in a worker thread)
+        # and executes each round's tool calls concurrently. Each request
+        # runs with its own history so overlapping requests never
+        # interleave their turns on the shared agent's state.
+        resp = await agent.aask(
             req.query,
             max_iterations=req.max_iterations,
             verbose=req.verbose,
+            history=[],
         )
 
         return AskResponse(answer=resp["answer"])
     except Exception as e:
         # Prevent leaking full tracebacks in the response
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# Direct read endpoints: serve the pre-serialized section dumps from the
+# portfolio cache without involving the LLM at all.
+_SECTION_GETTERS = {
+    "profile": DEFAULT_TOOLS.get_profile,
+    "contact": DEFAULT_TOOLS.get_contact,
+    "links": DEFAULT_TOOLS.get_links,
+    "about": DEFAULT_TOOLS.get_about,
+    "education": DEFAULT_TOOLS.get_education,
+    "skills": DEFAULT_TOOLS.get_skills,
+    "experience": DEFAULT_TOOLS.get_experience,
+    "projects": DEFAULT_TOOLS.get_projects,
+}
+
+
+@fastapi_app.get("/portfolio/{section}")
+async def get_portfolio_section(section: str, if_none_match: str = Header(None)):
+    getter = _SECTION_GETTERS.get(section)
+    if getter is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown section: {section}",
+        )
+
+    # ETag from the data file's mtime, matching the cache key in agent_tools,
+    # so clients and CDNs revalidate cheaply and refetch only on change.
+    try:
+        etag = f'"{DEFAULT_TOOLS.data_path.stat().st_mtime_ns}"'
+    except OSError:
+        etag = None
+
+    headers = {"Cache-Control": "public, max-age=300"}
+    if etag is not None:
+        headers["ETag"] = etag
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+
+    return Response(
+        content=getter(),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -11,9 +11,52 @@ The LLM autonomously decides:
 The LLM makes ALL decisions.
 """
 
-from typing import Dict, Any
+import asyncio
+from collections import deque
+from typing import Dict, Any, NamedTuple
+import inspect
 import json
-from agent_tools import PortfolioTools, get_tool_definitions
+from agent_tools import DEFAULT_TOOLS, TOOL_DEFINITIONS, PortfolioTools
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+# Keep at most this many history entries; unbounded history inflates every
+# subsequent prompt and grows memory for the life of the process.
+HISTORY_MAXLEN = 20
+
+# Lightweight per-tool-call records; cheaper to allocate than dicts and
+# converted back to dicts only once, at return time.
+class _Step(NamedTuple):
+    action: str
+    arguments: Any
+    result_preview: str
+
+
+class _Call(NamedTuple):
+    tool: str
+    args: Any
+
+
+# Rough character budget for history content (a proxy for prompt tokens).
+# Even within the entry cap, a few large answers could keep re-sending
+# thousands of tokens every turn; drop oldest entries past this budget.
+HISTORY_MAX_CHARS = 16_000
 
 
 class LLMPortfolioAgent:
@@ -27,7 +70,7 @@ class LLMPortfolioAgent:
     - Response generation
     """
 
-    def __init__(self, llm_client, model: str = "gpt-3.5-turbo", provider: str = "openai", data_path=None):
+    def __init__(self, llm_client, model: str = "gpt-3.5-turbo", provider: str = "openai", data_path=None, data=None):
         """
         Initialize LLM agent.
 
@@ -36,13 +79,49 @@ class LLMPortfolioAgent:
             model: Model name to use
             provider: "ollama" or "openai"
             data_path: Optional path to portfolio_data.json
+            data: Optional pre-parsed portfolio dict; skips the file read
         """
         self.llm_client = llm_client
         self.model = model
-        self.tools = PortfolioTools(data_path)
-        self.tool_definitions = get_tool_definitions()
-        self.conversation_history = []
+        if data is not None:
+            self.tools = PortfolioTools(data_path, data=data)
+        elif data_path is None:
+            self.tools = DEFAULT_TOOLS
+        else:
+            self.tools = PortfolioTools(data_path)
+        self.tool_definitions = TOOL_DEFINITIONS
+        # Name -> bound method table built once; also validates at startup
+        # that every advertised tool actually exists on PortfolioTools.
+        self._dispatch = {
+            definition["function"]["name"]: getattr(
+                self.tools, definition["function"]["name"]
+            )
+            for definition in self.tool_definitions
+        }
+        # Per-tool accepted parameter names, so hallucinated extra arguments
+        # are filtered out instead of raising TypeError at call time.
+        self._allowed_args = {
+            name: frozenset(inspect.signature(method).parameters)
+            for name, method in self._dispatch.items()
+        }
+        self.conversation_history = deque(maxlen=HISTORY_MAXLEN)
         self.provider = provider
+        # Bind the provider-specific chat implementation once so the hot
+        # loop doesn't branch on provider for every LLM call.
+        if provider == "openai":
+            self._chat = self._chat_openai
+            self._chat_stream = self._chat_stream_openai
+            # Static request kwargs built once; per call only messages change
+            self._openai_kwargs = {
+                "model": self.model,
+                "tools": self.tool_definitions,
+                "tool_choice": "auto",
+            }
+        elif provider == "ollama":
+            self._chat = self._chat_ollama
+            self._chat_stream = self._chat_stream_ollama
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
         # System prompt that guides the LLM's behavior
         self.system_prompt = """
 You are the portfolio assistant for Rakshya Pandey.
@@ -68,9 +147,9 @@ Response guidelines:
 - If asked for contact info, provide the email from the data.
 """
 
-    def _chat(self, messages, tools=None):
+    def _chat_ollama(self, messages, tools=None):
         """
-        Backend independent chat call.
+        Ollama chat call.
 
         Returns a dict with shape:
         {
@@ -81,80 +160,185 @@ Response guidelines:
             }
         }
         """
-        if self.provider == "ollama":
-            # Ollama already returns a dict with a "message" key
-            resp = self.llm_client.chat(
+        # Ollama already returns a dict with a "message" key
+        resp = self.llm_client.chat(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+        )
+        # Assume resp has a "message" key
+        return resp
+
+    def _chat_openai(self, messages, tools=None):
+        """OpenAI chat call; same return shape as _chat_ollama."""
+        # OpenAI Python v1 style
+        create = self.llm_client.chat.completions.create
+        if tools is None:
+            resp = create(model=self.model, messages=messages)
+        elif tools is self.tool_definitions:
+            # Common case: reuse the prebuilt kwargs dict
+            resp = create(messages=messages, **self._openai_kwargs)
+        else:
+            resp = create(
                 model=self.model,
                 messages=messages,
                 tools=tools,
+                tool_choice="auto",
             )
-            # Assume resp has a "message" key
-            return resp
+        msg = resp.choices[0].message
+
+        # Normalize OpenAI Message to our expected shape
+        norm = {
+            "role": msg.role,
+            "content": msg.content or "",
+        }
+
+        # Normalize tool calls, if any
+        if getattr(msg, "tool_calls", None):
+            tool_calls = []
+            for tc in msg.tool_calls:
+                if tc.type != "function":
+                    continue
+                args = tc.function.arguments
+                tool_calls.append(
+                    {
+                        "id": tc.id,
+                        "type": tc.type,
+                        "function": {
+                            "name": tc.function.name,
+                            "arguments": args,
+                        },
+                    }
+                )
+            if tool_calls:
+                norm["tool_calls"] = tool_calls
+
+        usage = getattr(resp, "usage", None)
+        norm_usage = None
+        if usage is not None:
+            norm_usage = {
+                "input_tokens": getattr(usage, "prompt_tokens", None),
+                "output_tokens": getattr(usage, "completion_tokens", None),
+                "total_tokens": getattr(usage, "total_tokens", None),
+            }
 
-        elif self.provider == "openai":
-            # OpenAI Python v1 style
-            resp = self.llm_client.chat.completions.create(
+        return {
+            "message": norm,
+            "usage": norm_usage,
+        }
+
+    def _chat_stream_ollama(self, messages, tools=None):
+        """
+        Streaming Ollama chat call.
+
+        Yields content chunks as they arrive and returns the assembled
+        response in the same shape as _chat_ollama (consume with
+        `yield from` to capture the return value).
+        """
+        content_parts = []
+        tool_calls = []
+        for chunk in self.llm_client.chat(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            stream=True,
+        ):
+            message = chunk.get("message", {})
+            piece = message.get("content") or ""
+            if piece:
+                content_parts.append(piece)
+                yield piece
+            tool_calls.extend(message.get("tool_calls") or [])
+
+        assembled = {"role": "assistant", "content": "".join(content_parts)}
+        if tool_calls:
+            assembled["tool_calls"] = tool_calls
+        return {"message": assembled, "usage": None}
+
+    def _chat_stream_openai(self, messages, tools=None):
+        """Streaming OpenAI chat call; same contract as _chat_stream_ollama."""
+        create = self.llm_client.chat.completions.create
+        if tools is None:
+            stream = create(model=self.model, messages=messages, stream=True)
+        elif tools is self.tool_definitions:
+            stream = create(messages=messages, stream=True,
+                            **self._openai_kwargs)
+        else:
+            stream = create(
                 model=self.model,
                 messages=messages,
                 tools=tools,
                 tool_choice="auto",
+                stream=True,
             )
-            msg = resp.choices[0].message
-
-            # Normalize OpenAI Message to our expected shape
-            norm = {
-                "role": msg.role,
-                "content": msg.content or "",
-            }
-
-            # Normalize tool calls, if any
-            if getattr(msg, "tool_calls", None):
-                tool_calls = []
-                for tc in msg.tool_calls:
-                    if tc.type != "function":
-                        continue
-                    args = tc.function.arguments
-                    tool_calls.append(
-                        {
-                            "id": tc.id,
-                            "type": tc.type,
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": args,
-                            },
-                        }
-                    )
-                if tool_calls:
-                    norm["tool_calls"] = tool_calls
-
-            usage = getattr(resp, "usage", None)
-            norm_usage = None
-            if usage is not None:
-                norm_usage = {
-                    "input_tokens": getattr(usage, "prompt_tokens", None),
-                    "output_tokens": getattr(usage, "completion_tokens", None),
-                    "total_tokens": getattr(usage, "total_tokens", None),
-                }
-
-            return {
-                "message": norm,
-                "usage": norm_usage,
-            }
 
-        else:
-            raise ValueError(f"Unsupported provider: {self.provider}")
+        content_parts = []
+        tool_calls_by_index = {}
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                yield delta.content
+            # Tool calls arrive as partial deltas keyed by index; the
+            # argument string accumulates across chunks.
+            for tc in delta.tool_calls or []:
+                entry = tool_calls_by_index.setdefault(tc.index, {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                })
+                if tc.id:
+                    entry["id"] = tc.id
+                if tc.function is not None:
+                    if tc.function.name:
+                        entry["function"]["name"] = tc.function.name
+                    if tc.function.arguments:
+                        entry["function"]["arguments"] += tc.function.arguments
+
+        assembled = {"role": "assistant", "content": "".join(content_parts)}
+        if tool_calls_by_index:
+            assembled["tool_calls"] = [
+                tool_calls_by_index[index]
+                for index in sorted(tool_calls_by_index)
+            ]
+        return {"message": assembled, "usage": None}
 
     def ask(
         self,
         query: str,
         max_iterations: int = 5,
-        verbose: bool = False
+        verbose: bool = False,
+        history=None
+    ) -> Dict[str, Any]:
+        """Synchronous wrapper around aask for back-compat."""
+        return asyncio.run(self.aask(
+            query, max_iterations=max_iterations, verbose=verbose,
+            history=history))
+
+    async def aask(
+        self,
+        query: str,
+        max_iterations: int = 5,
+        verbose: bool = False,
+        history=None
     ) -> Dict[str, Any]:
-        self.conversation_history.append({"role": "user", "content": query})
+        """Async agent loop: LLM calls run in a worker thread and each
+        round's tool calls execute concurrently via asyncio.gather.
+
+        history, if given, is a caller-owned list of message dicts used as
+        the conversation (and appended to in place), so one agent instance
+        can serve many independent conversations; when omitted, the agent's
+        own conversation_history is used.
+        """
+        conversation = self.conversation_history if history is None else history
+        conversation.append({"role": "user", "content": query})
+        self._trim_history(conversation)
 
         messages = [
             {"role": "system", "content": self.system_prompt},
-            *self.conversation_history,
+            *conversation,
         ]
 
         reasoning_steps = []
@@ -167,8 +351,14 @@ Response guidelines:
             if verbose:
                 print(f"\n--- Iteration {iteration + 1} ---")
 
-            # Use unified chat helper
-            response = self._chat(messages, tools=self.tool_definitions)
+            # Re-sending every historical tool blob each round multiplies
+            # prompt bytes; keep only the latest result per tool.
+            self._supersede_stale_tool_results(messages)
+
+            # Use unified chat helper; the call blocks on network I/O, so
+            # run it in a thread to keep the event loop free.
+            response = await asyncio.to_thread(
+                self._chat, messages, tools=self.tool_definitions)
 
             # Log token usage for this call (if available)
             llm_usage = response.get("usage")
@@ -192,73 +382,11 @@ Response guidelines:
             tool_calls = message.get("tool_calls")
 
             if tool_calls:
-                # LLM decided to use tools
-                for tool_call in tool_calls:
-                    function = tool_call.get("function", {})
-                    tool_name = function.get("name")
-                    tool_args = function.get("arguments")
-
-                    if verbose:
-                        print(f"Tool Call: {tool_name}")
-                        print(f"Arguments: {tool_args}")
-
-                    tool_result = self._execute_tool(tool_name, tool_args)
-                    last_tool_result = tool_result
-
-                    reasoning_steps.append({
-                        "action": f"Called {tool_name}",
-                        "arguments": tool_args,
-                        "result_preview": tool_result,
-                    })
-
-                    tool_calls_made.append({
-                        "tool": tool_name,
-                        "args": tool_args,
-                    })
-
-                    # Ensure arguments for tool_call in messages are dict, not JSON string (For OLLAMA)
-                    if isinstance(tool_args, str):
-                        try:
-                            parsed_args = json.loads(tool_args)
-                        except json.JSONDecodeError:
-                            parsed_args = {"raw_arguments": tool_args}
-                    else:
-                        parsed_args = tool_args
-
-                    # Prepare arguments for the next LLM call
-                    #    OpenAI wants JSON string, Ollama is fine with dict
-                    if getattr(self, "provider", "ollama") == "openai":
-                        arguments_for_message = (
-                            tool_args
-                            if isinstance(tool_args, str)
-                            else json.dumps(parsed_args)
-                        )
-                    else:
-                        arguments_for_message = parsed_args
-
-                    tool_call_id = tool_call.get("id", f"call_{iteration}")
-                    # Add assistant tool call to messages
-                    messages.append({
-                        "role": "assistant",
-                        "content": "",
-                        "tool_calls": [{
-                            "id": tool_call_id,
-                            "type": "function",
-                            "function": {
-                                "name": tool_name,
-                                "arguments": arguments_for_message,
-                            },
-                        }],
-                    })
-
-                    # Add tool result back for next LLM step
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "name": tool_name,
-                        "content": tool_result,
-                    })
-
+                # LLM decided to use tools; run the round concurrently
+                last_tool_result = await self._run_tool_calls_async(
+                    tool_calls, messages, reasoning_steps, tool_calls_made,
+                    iteration, verbose=verbose,
+                )
                 # Continue loop. LLM will see new tool outputs in messages.
                 continue
 
@@ -268,29 +396,28 @@ Response guidelines:
             if verbose:
                 print(f"Final Answer: {final_answer}")
 
-            self.conversation_history.append({
+            conversation.append({
                 "role": "assistant",
                 "content": final_answer,
             })
 
-            return {
+            result = {
                 "answer": final_answer,
-                "reasoning_steps": reasoning_steps,
-                "tool_calls_made": tool_calls_made,
+                "reasoning_steps": [step._asdict() for step in reasoning_steps],
+                "tool_calls_made": [call._asdict() for call in tool_calls_made],
                 "iterations": iteration + 1,
                 "model": self.model,
                 "tool_result": last_tool_result,
                 "usage_log": usage_log,
             }
+            return result
 
         # Fallback when reaching max_iterations
-        final_response = self._chat(
-            messages + [{
-                "role": "system",
-                "content": "Please provide your final answer based on the information gathered so far.",
-            }],
-            tools=None,
-        )
+        messages.append({
+            "role": "system",
+            "content": "Please provide your final answer based on the information gathered so far.",
+        })
+        final_response = await asyncio.to_thread(self._chat, messages, tools=None)
 
         final_usage = final_response.get("usage")
         if final_usage is not None:
@@ -311,45 +438,354 @@ Response guidelines:
             "I need more information to provide a complete answer.",
         )
 
-        self.conversation_history.append({
+        conversation.append({
             "role": "assistant",
             "content": final_answer,
         })
 
-        return {
+        result = {
             "answer": final_answer,
-            "reasoning_steps": reasoning_steps,
-            "tool_calls_made": tool_calls_made,
+            "reasoning_steps": [step._asdict() for step in reasoning_steps],
+            "tool_calls_made": [call._asdict() for call in tool_calls_made],
             "iterations": max_iterations,
             "model": self.model,
             "note": "Reached max iterations",
             "usage_log": usage_log,
         }
+        return result
 
-    def _execute_tool(self, tool_name: str, arguments: Any) -> str:
-        """Execute a tool and return results"""
-        try:
-            # Parse arguments if string
-            if isinstance(arguments, str):
-                args = json.loads(arguments)
-            else:
-                args = arguments
+    def ask_stream(
+        self,
+        query: str,
+        max_iterations: int = 5,
+        verbose: bool = False,
+        cancel_event=None,
+        history=None,
+        result=None
+    ):
+        """
+        Streaming variant of ask(): yields answer text chunks as the LLM
+        produces them. Tool-call rounds run between yields; the full result
+        dict (same shape as ask()) is the generator's return value
+        (StopIteration.value) and is also written into result, a caller-
+        owned dict filled in place on completion — no state is left on the
+        shared agent.
+
+        cancel_event, if given, is a threading.Event checked before each
+        LLM call and each tool dispatch; setting it stops the loop early.
+        history works as in aask: a caller-owned conversation list that
+        keeps the shared agent stateless across sessions.
+        """
+        if result is None:
+            result = {}
+        conversation = self.conversation_history if history is None else history
+        conversation.append({"role": "user", "content": query})
+        self._trim_history(conversation)
+
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            *conversation,
+        ]
+
+        reasoning_steps = []
+        tool_calls_made = []
+        last_tool_result = None
+
+        for iteration in range(max_iterations):
+            if cancel_event is not None and cancel_event.is_set():
+                self._finish_cancelled(result, reasoning_steps,
+                                       tool_calls_made, iteration,
+                                       last_tool_result)
+                return result
+
+            if verbose:
+                print(f"\n--- Iteration {iteration + 1} ---")
+
+            self._supersede_stale_tool_results(messages)
 
+            response = yield from self._chat_stream(
+                messages, tools=self.tool_definitions)
+
+            message = response.get("message", {})
+            tool_calls = message.get("tool_calls")
+
+            if tool_calls:
+                last_tool_result = self._run_tool_calls(
+                    tool_calls, messages, reasoning_steps, tool_calls_made,
+                    iteration, verbose=verbose, cancel_event=cancel_event,
+                )
+                continue
+
+            # No tool calls: the streamed content was the final answer.
+            final_answer = message.get("content", "")
+
+            conversation.append({
+                "role": "assistant",
+                "content": final_answer,
+            })
+
+            result.update({
+                "answer": final_answer,
+                "reasoning_steps": [step._asdict() for step in reasoning_steps],
+                "tool_calls_made": [call._asdict() for call in tool_calls_made],
+                "iterations": iteration + 1,
+                "model": self.model,
+                "tool_result": last_tool_result,
+                "usage_log": [],
+            })
+            return result
+
+        if cancel_event is not None and cancel_event.is_set():
+            self._finish_cancelled(result, reasoning_steps, tool_calls_made,
+                                   max_iterations, last_tool_result)
+            return result
+
+        # Fallback when reaching max_iterations
+        messages.append({
+            "role": "system",
+            "content": "Please provide your final answer based on the information gathered so far.",
+        })
+        final_response = yield from self._chat_stream(messages, tools=None)
+
+        final_answer = final_response.get("message", {}).get(
+            "content",
+            "I need more information to provide a complete answer.",
+        )
+
+        conversation.append({
+            "role": "assistant",
+            "content": final_answer,
+        })
+
+        result.update({
+            "answer": final_answer,
+            "reasoning_steps": [step._asdict() for step in reasoning_steps],
+            "tool_calls_made": [call._asdict() for call in tool_calls_made],
+            "iterations": max_iterations,
+            "model": self.model,
+            "note": "Reached max iterations",
+            "usage_log": [],
+        })
+        return result
+
+    def _finish_cancelled(self, result, reasoning_steps, tool_calls_made,
+                          iterations, last_tool_result):
+        """Record a cancelled ask_stream run in the caller's result sink."""
+        result.update({
+            "answer": "",
+            "reasoning_steps": [step._asdict() for step in reasoning_steps],
+            "tool_calls_made": [call._asdict() for call in tool_calls_made],
+            "iterations": iterations,
+            "model": self.model,
+            "tool_result": last_tool_result,
+            "note": "Cancelled",
+            "usage_log": [],
+        })
+
+    def _prepare_tool_call(self, tool_call):
+        """Extract the tool name and parse its arguments exactly once.
+
+        Tools and the message log both consume the parsed dict. (Ollama
+        hands us a dict, OpenAI a JSON string.)
+        """
+        function = tool_call.get("function", {})
+        tool_name = function.get("name")
+        tool_args = function.get("arguments")
+
+        if isinstance(tool_args, str):
+            try:
+                parsed_args = _json_loads(tool_args)
+            except ValueError:
+                parsed_args = {"raw_arguments": tool_args}
+        else:
+            parsed_args = tool_args
+
+        return tool_name, tool_args, parsed_args
+
+    def _record_tool_result(
+        self,
+        tool_call,
+        tool_name,
+        tool_args,
+        parsed_args,
+        tool_result,
+        messages,
+        reasoning_steps,
+        tool_calls_made,
+        iteration: int,
+    ):
+        """Record a finished tool call and append the assistant/tool pair."""
+        reasoning_steps.append(_Step(
+            action=f"Called {tool_name}",
+            arguments=tool_args,
+            result_preview=tool_result,
+        ))
+
+        tool_calls_made.append(_Call(
+            tool=tool_name,
+            args=tool_args,
+        ))
+
+        # Prepare arguments for the next LLM call
+        #    OpenAI wants JSON string, Ollama is fine with dict
+        if getattr(self, "provider", "ollama") == "openai":
+            arguments_for_message = (
+                tool_args
+                if isinstance(tool_args, str)
+                else _json_dumps(parsed_args)
+            )
+        else:
+            arguments_for_message = parsed_args
+
+        tool_call_id = tool_call.get("id", f"call_{iteration}")
+        # Add assistant tool call to messages
+        messages.append({
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{
+                "id": tool_call_id,
+                "type": "function",
+                "function": {
+                    "name": tool_name,
+                    "arguments": arguments_for_message,
+                },
+            }],
+        })
+
+        # Add tool result back for next LLM step
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call_id,
+            "name": tool_name,
+            "content": tool_result,
+        })
+
+    def _run_tool_calls(
+        self,
+        tool_calls,
+        messages,
+        reasoning_steps,
+        tool_calls_made,
+        iteration: int,
+        verbose: bool = False,
+        cancel_event=None,
+    ):
+        """Execute one round of tool calls, recording them and appending the
+        assistant/tool message pairs. Returns the last tool result."""
+        last_tool_result = None
+        for tool_call in tool_calls:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            tool_name, tool_args, parsed_args = self._prepare_tool_call(
+                tool_call)
+
+            if verbose:
+                print(f"Tool Call: {tool_name}")
+                print(f"Arguments: {tool_args}")
+
+            tool_result = self._execute_tool(tool_name, parsed_args)
+            last_tool_result = tool_result
+
+            self._record_tool_result(
+                tool_call, tool_name, tool_args, parsed_args, tool_result,
+                messages, reasoning_steps, tool_calls_made, iteration,
+            )
+
+        return last_tool_result
+
+    async def _run_tool_calls_async(
+        self,
+        tool_calls,
+        messages,
+        reasoning_steps,
+        tool_calls_made,
+        iteration: int,
+        verbose: bool = False,
+    ):
+        """Like _run_tool_calls, but executes the round's tools concurrently
+        via asyncio.gather; results are recorded in the original order."""
+        prepared = [
+            (tool_call, *self._prepare_tool_call(tool_call))
+            for tool_call in tool_calls
+        ]
+
+        if verbose:
+            for _, tool_name, tool_args, _ in prepared:
+                print(f"Tool Call: {tool_name}")
+                print(f"Arguments: {tool_args}")
+
+        results = await asyncio.gather(*[
+            asyncio.to_thread(self._execute_tool, tool_name, parsed_args)
+            for _, tool_name, _, parsed_args in prepared
+        ])
+
+        last_tool_result = None
+        for (tool_call, tool_name, tool_args, parsed_args), tool_result in zip(
+                prepared, results):
+            last_tool_result = tool_result
+            self._record_tool_result(
+                tool_call, tool_name, tool_args, parsed_args, tool_result,
+                messages, reasoning_steps, tool_calls_made, iteration,
+            )
+
+        return last_tool_result
+
+    def _execute_tool(self, tool_name: str, args: Dict[str, Any]) -> str:
+        """Execute a tool with already-parsed arguments and return results"""
+        try:
             # Get the tool method
-            tool_method = getattr(self.tools, tool_name, None)
+            tool_method = self._dispatch.get(tool_name)
             if not tool_method:
-                return json.dumps({"error": f"Tool {tool_name} not found"})
+                return _json_dumps({"error": f"Tool {tool_name} not found"})
+
+            # Keep only arguments the tool accepts; coerce limit defensively
+            allowed = self._allowed_args[tool_name]
+            kwargs = {k: v for k, v in (args or {}).items() if k in allowed}
+            if "limit" in kwargs and not isinstance(kwargs["limit"], int):
+                try:
+                    kwargs["limit"] = int(kwargs["limit"])
+                except (TypeError, ValueError):
+                    del kwargs["limit"]
 
             # Call the tool
-            result = tool_method(**args)
+            result = tool_method(**kwargs)
             return result
 
         except Exception as e:
-            return json.dumps({"error": f"Error executing {tool_name}: {str(e)}"})
+            return _json_dumps({"error": f"Error executing {tool_name}: {str(e)}"})
+
+    _SUPERSEDED_NOTE = '{"note": "superseded, see the later call to this tool"}'
+
+    def _supersede_stale_tool_results(self, messages):
+        """Replace all but the latest result per tool with a short note."""
+        seen = set()
+        for message in reversed(messages):
+            if message.get("role") != "tool":
+                continue
+            name = message.get("name")
+            if name in seen:
+                message["content"] = self._SUPERSEDED_NOTE
+            else:
+                seen.add(name)
+
+    def _trim_history(self, conversation=None):
+        """Drop oldest entries past the entry cap or character budget."""
+        if conversation is None:
+            conversation = self.conversation_history
+        # Caller-owned lists lack the internal deque's maxlen; apply the
+        # same entry cap here so both bounds hold for either container.
+        while len(conversation) > HISTORY_MAXLEN:
+            del conversation[0]
+        total = sum(len(entry.get("content") or "")
+                    for entry in conversation)
+        while total > HISTORY_MAX_CHARS and len(conversation) > 1:
+            dropped = conversation[0]
+            del conversation[0]
+            total -= len(dropped.get("content") or "")
 
     def reset_conversation(self):
         """Reset conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
 
 
 if __name__ == "__main__":
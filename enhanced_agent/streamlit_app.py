@@ -8,19 +8,92 @@ This app demonstrates the autonomous LLM agent with:
 
 from portfolio_agent import LLMPortfolioAgent
 import streamlit as st
+import json
+import socket
 import sys
 import os
+import threading
+import time
+import uuid
 from pathlib import Path
 from config_provider import EnvConfigProvider
-from ollama import Client as OllamaClient
-from openai import OpenAI
 
-# Add paths
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "core"))
-sys.path.insert(0, os.path.dirname(__file__))
+# Add paths once; Streamlit re-executes this script on every interaction,
+# but sys.path persists for the process, so guard against re-inserting.
+for _extra_path in (
+    os.path.join(os.path.dirname(__file__), "..", "core"),
+    os.path.dirname(__file__),
+):
+    if _extra_path not in sys.path:
+        sys.path.insert(0, _extra_path)
 
 DATA_PATH = Path(__file__).with_name("portfolio_data.json")
 
+# Only this many of the newest assistant messages get their reasoning and
+# tool-call expanders rebuilt on a rerun; older ones render just content.
+MAX_DETAILED_MESSAGES = 10
+
+# Chat history survives browser reloads in a local JSON file, so a
+# reconnect doesn't force users to re-send (and re-pay for) old prompts.
+# Files are keyed per visitor (see _chat_store_path) so one visitor never
+# hydrates with — or overwrites — another visitor's conversation.
+CHAT_STORE_DIR = Path.home() / ".portfolio_agent"
+SAVE_THROTTLE_SECONDS = 2.0
+
+
+def _chat_store_path() -> Path:
+    """Per-visitor chat store path, keyed by a session id carried in the URL.
+
+    The id rides in a query param so it survives a browser reload; anything
+    that isn't one of our generated hex ids is replaced rather than used as
+    a filename.
+    """
+    sid = st.session_state.get("_chat_sid")
+    if sid is None:
+        sid = st.query_params.get("sid", "")
+        if not (len(sid) == 32 and all(c in "0123456789abcdef" for c in sid)):
+            sid = uuid.uuid4().hex
+        st.query_params["sid"] = sid
+        st.session_state._chat_sid = sid
+    return CHAT_STORE_DIR / f"chat_{sid}.json"
+
+# Sidebar example queries; constant, so built once at import instead of
+# per rerun, along with their (short, integer-suffixed) widget keys.
+EXAMPLES = (
+    "Give me a short summary of Rakshya's background.",
+    "What skills does Rakshya have?",
+    "List her recent projects with links.",
+    "What is her work experience?",
+    "How can I contact Rakshya?",
+)
+EXAMPLE_KEYS = tuple(f"ex_{i}" for i in range(len(EXAMPLES)))
+
+
+def load_saved_messages() -> list:
+    """Hydrate this visitor's chat history; missing/corrupt files mean a fresh start."""
+    try:
+        return json.loads(_chat_store_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def save_messages(force: bool = False):
+    """Write chat history to disk, throttled and skipped when unchanged."""
+    messages = st.session_state.messages
+    if messages == st.session_state.get("_last_saved_messages"):
+        return
+    now = time.monotonic()
+    if not force and now - st.session_state.get("_last_save_time", 0.0) < SAVE_THROTTLE_SECONDS:
+        return
+    try:
+        store_path = _chat_store_path()
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        store_path.write_text(json.dumps(messages), encoding="utf-8")
+    except OSError:
+        return
+    st.session_state._last_saved_messages = list(messages)
+    st.session_state._last_save_time = now
+
 
 def app():
     """Main Streamlit app function"""
@@ -44,10 +117,23 @@ def app():
     @st.cache_resource
     def get_llm_client(llm_type: str, api_key: str = None):
         """Initialize LLM client"""
+        # Import lazily so the unused provider's package (httpx, pydantic
+        # models, etc.) never loads; cache_resource runs this once per
+        # provider per process.
         if llm_type == "Ollama":
             try:
-                client = OllamaClient(host="http://localhost:11434")
-                client.list()  # Test connection
+                import httpx
+                from ollama import Client as OllamaClient
+
+                # Cheap reachability probe instead of a blocking HTTP model
+                # listing; real errors surface on the first chat call.
+                socket.create_connection(("localhost", 11434),
+                                         timeout=0.25).close()
+                # Explicit timeouts; ollama forwards kwargs to httpx.Client
+                client = OllamaClient(
+                    host="http://localhost:11434",
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                )
                 return client, None
             except ImportError:
                 return None, "Ollama package not installed. Run: pip install ollama"
@@ -57,7 +143,22 @@ def app():
             try:
                 if not api_key:
                     return None, "OpenAI API key required"
-                client = OpenAI(api_key=api_key)
+                import httpx
+                from openai import OpenAI
+
+                # Tuned connection pool so the ReAct loop's sequential LLM
+                # calls reuse keep-alive connections instead of re-doing
+                # TCP/TLS handshakes; HTTP/2 when the h2 package is present.
+                limits = httpx.Limits(max_connections=32,
+                                      max_keepalive_connections=16)
+                timeout = httpx.Timeout(60.0, connect=5.0)
+                try:
+                    http_client = httpx.Client(
+                        http2=True, limits=limits, timeout=timeout)
+                except ImportError:  # h2 not installed
+                    http_client = httpx.Client(limits=limits, timeout=timeout)
+
+                client = OpenAI(api_key=api_key, http_client=http_client)
                 return client, None
             except ImportError:
                 return None, "OpenAI package not installed. Run: pip install openai"
@@ -67,6 +168,31 @@ def app():
         else:
             raise ValueError("Unsupported LLM type")
 
+    @st.cache_data
+    def load_portfolio(path: str, mtime: float) -> dict:
+        """Load the portfolio JSON once per file version (keyed by mtime)."""
+        return json.loads(Path(path).read_text(encoding="utf-8-sig"))
+
+    @st.cache_resource
+    def get_agent(_llm_client, provider: str, model: str, data_path: str,
+                  mtime: float):
+        """Build (or reuse) one agent per (provider, model, data_path).
+
+        Shared across sessions and reruns, so the portfolio JSON parse and
+        tool-schema construction happen once per process, not per session.
+        The agent must stay stateless per session: every call passes the
+        session's own history, never relying on the shared instance's
+        internal conversation state. The client is underscore-prefixed so
+        Streamlit doesn't try to hash it.
+        """
+        return LLMPortfolioAgent(
+            llm_client=_llm_client,
+            model=model,
+            provider=provider,
+            data_path=Path(data_path),
+            data=load_portfolio(data_path, mtime),
+        )
+
     # Main UI
     st.title("Portfolio AI Agent")
     st.markdown("""
@@ -133,19 +259,19 @@ def app():
 
         st.markdown("---")
 
-        # Example queries
+        # Example queries. Short integer-suffixed keys; keying on the full
+        # prompt text made Streamlit hash a long variable-length string per
+        # button per rerun. The on_click callback queues the prompt before
+        # the rerun starts, so the click resolves in a single pass with no
+        # extra flag-checking round-trip.
         st.subheader("Example Queries")
-        examples = [
-            "Give me a short summary of Rakshya's background.",
-            "What skills does Rakshya have?",
-            "List her recent projects with links.",
-            "What is her work experience?",
-            "How can I contact Rakshya?"
-        ]
 
-        for example in examples:
-            if st.button(example, key=f"ex_{example}", use_container_width=True):
-                st.session_state.example_query = example
+        def _queue_example(example: str):
+            st.session_state.example_query = example
+
+        for key, example in zip(EXAMPLE_KEYS, EXAMPLES):
+            st.button(example, key=key, use_container_width=True,
+                      on_click=_queue_example, args=(example,))
 
     # Initialize LLM client
     llm_client, error = get_llm_client(
@@ -163,108 +289,218 @@ def app():
 
     provider = "ollama" if "Ollama" in llm_type else "openai"
 
-    # Initialize agents
-    if "llm_agent" not in st.session_state or st.session_state.get("llm_type") != llm_type:
-        st.session_state.llm_agent = LLMPortfolioAgent(
-            llm_client=llm_client,
-            model=model_name,
-            provider=provider,
-            data_path=DATA_PATH,
+    # One shared agent per (provider, model); only chat messages are
+    # per-session state.
+    agent = get_agent(llm_client, provider, model_name, str(DATA_PATH),
+                      DATA_PATH.stat().st_mtime)
+
+    # Key the session's agent binding on exactly (provider, model): model
+    # switches take effect immediately (returning to a previously used pair
+    # reuses its cached agent), and the freshly selected model starts from a
+    # clean LLM context rather than inheriting the previous model's. The
+    # agent is shared across sessions, so never reset its internal state
+    # here; instead mark where this session's LLM context begins.
+    agent_key = (provider, model_name)
+    if st.session_state.get("_agent_key") != agent_key:
+        if "_agent_key" in st.session_state:
+            st.session_state.context_start = len(
+                st.session_state.get("messages", []))
+        st.session_state._agent_key = agent_key
+
+    @st.cache_data(show_spinner=False, ttl=3600)
+    def cached_ask(prompt: str, model: str, llm_provider: str,
+                   portfolio_mtime: float, iterations: int,
+                   verbose: bool) -> dict:
+        """Answer cache for repeated prompts (the sidebar examples).
+
+        Keyed on prompt/model/provider plus the data file's mtime, so an
+        edited portfolio invalidates stale answers; identical clicks are
+        served in milliseconds instead of re-paying for an LLM round trip.
+        The agent settings arrive as parameters (closed-over values don't
+        participate in the cache key), so moving a slider isn't answered
+        from a stale entry. Answers are cached (and shared) across
+        sessions, so each runs with a fresh history rather than the
+        caller's conversation.
+        """
+        return agent.ask(
+            prompt,
+            max_iterations=iterations,
+            verbose=verbose,
+            history=[],
         )
-        st.session_state.llm_type = llm_type
 
-    # Initialize session state
+    # Initialize session state, restoring any persisted chat history
     if "messages" not in st.session_state:
-        st.session_state.messages = []
-
-    # Display chat history
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            if message["role"] == "user":
-                st.markdown(message["content"])
-            else:
+        st.session_state.messages = load_saved_messages()
+
+    # Display chat history; only recent messages rebuild their expanders so
+    # rerun cost stays flat as the conversation grows. As a fragment, its
+    # own interactions (expander toggles) rerun just this block.
+    @st.fragment
+    def render_history():
+        history = st.session_state.messages
+        detail_start = max(0, len(history) - MAX_DETAILED_MESSAGES)
+        for index, message in enumerate(history):
+            with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
+                if message["role"] == "user" or index < detail_start:
+                    continue
+
                 if show_reasoning and "reasoning_steps" in message:
                     with st.expander("LLM Reasoning Steps"):
                         for i, step in enumerate(message["reasoning_steps"], 1):
                             st.write(f"**{i}.** {step.get('action', step)}")
                             if isinstance(step, dict) and "result_preview" in step:
+                                # Previews are pre-truncated at ingest
                                 st.caption(
-                                    f"Result: {step['result_preview']}...")
+                                    f"Result: {step['result_preview']}")
 
                 if show_tool_calls and "tool_calls" in message:
                     with st.expander("Tools Called"):
                         for tool in message["tool_calls"]:
-                            st.code(
-                                f"{tool['tool']}({tool['args']})", language="python")
+                            # Single-line backticks skip the Pygments
+                            # highlighter st.code would run per rerun
+                            st.markdown(f"`{tool['tool']}({tool['args']})`")
 
                 if "iterations" in message:
                     st.caption(
                         f"Iterations: {message['iterations']} | Model: {message.get('model', 'N/A')}")
 
-    # Handle example query from sidebar
-    if "example_query" in st.session_state:
-        prompt = st.session_state.example_query
-        del st.session_state.example_query
-    else:
-        prompt = st.chat_input("Ask about Rakshya's portfolio...")
+    render_history()
+
+    # Chat input and response handling; as a fragment, a submitted prompt
+    # reruns only this block instead of re-walking the whole script.
+    @st.fragment
+    def handle_turn():
+        # A queued example (set by its button's on_click before this rerun)
+        # takes precedence; otherwise use the chat box's submission directly.
+        prompt = (st.session_state.pop("example_query", None)
+                  or st.chat_input("Ask about Rakshya's portfolio..."))
+
+        if not prompt:
+            return
 
-    if prompt:
         # Display user message
         with st.chat_message("user"):
             st.markdown(prompt)
 
+        # This session's LLM context (from the last model switch onward),
+        # built before the new prompt is committed; the shared agent gets
+        # it per call and never holds any session's conversation itself.
+        history = [
+            {"role": m["role"], "content": m["content"]}
+            for m in st.session_state.messages[
+                st.session_state.get("context_start", 0):]
+        ]
+
         st.session_state.messages.append({"role": "user", "content": prompt})
 
-        # Get LLM agent response
+        # Get LLM agent response. The fixed example queries go through the
+        # response cache (repeat clicks are free); free-form prompts stream
+        # tokens into a dedicated placeholder and commit on completion.
         with st.chat_message("assistant"):
-            with st.spinner("LLM agent thinking..."):
-                response = st.session_state.llm_agent.ask(
-                    prompt,
-                    max_iterations=max_iterations,
-                    verbose=verbose_llm
-                )
-            st.markdown(response["answer"])
+            if prompt in EXAMPLES:
+                response = cached_ask(prompt, model_name, provider,
+                                      DATA_PATH.stat().st_mtime,
+                                      max_iterations, verbose_llm)
+                st.markdown(response["answer"])
+            else:
+                # One Event per session; Stop sets it via on_click (which
+                # runs before the rerun), and the agent checks it before
+                # each LLM call and tool dispatch so a superseded run ends
+                # instead of burning further iterations.
+                cancel_event = st.session_state.setdefault(
+                    "cancel_event", threading.Event())
+                cancel_event.clear()
+                st.button("Stop", key="stop_gen", on_click=cancel_event.set)
+                # Per-call result sink: the generator fills this dict on
+                # completion, so the trace is read from this turn's own
+                # state rather than anything shared on the cached agent.
+                response = {}
+                stream_slot = st.empty()
+                with stream_slot.container():
+                    st.write_stream(
+                        agent.ask_stream(
+                            prompt,
+                            max_iterations=max_iterations,
+                            verbose=verbose_llm,
+                            cancel_event=cancel_event,
+                            history=history,
+                            result=response,
+                        )
+                    )
+
+            # Truncate result previews once at ingest; render sites (and the
+            # stored history) use the trimmed strings as-is.
+            reasoning_steps = [
+                {**step, "result_preview": f"{step['result_preview'][:100]}..."}
+                if step.get("result_preview") else step
+                for step in response["reasoning_steps"]
+            ]
+
             if show_reasoning:
                 with st.expander("LLM Reasoning Steps"):
-                    for i, step in enumerate(response["reasoning_steps"], 1):
+                    for i, step in enumerate(reasoning_steps, 1):
                         st.write(f"**{i}.** {step['action']}")
                         if "result_preview" in step:
-                            st.caption(
-                                f"Result: {step['result_preview'][:100]}...")
+                            st.caption(f"Result: {step['result_preview']}")
             if show_tool_calls:
                 with st.expander("Tools Called"):
                     for tool in response["tool_calls_made"]:
-                        st.code(f"{tool['tool']}({tool['args']})",
-                                language="python")
+                        st.markdown(f"`{tool['tool']}({tool['args']})`")
             st.caption(
                 f"Iterations: {response['iterations']} | Model: {response['model']}")
             # Store response
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": response["answer"],
-                "reasoning_steps": response["reasoning_steps"],
-                "tool_calls": response["tool_calls_made"],
+                "reasoning_steps": reasoning_steps,
+                # Stringify args once here so rerenders don't re-serialize
+                "tool_calls": [
+                    {
+                        "tool": tool["tool"],
+                        "args": tool["args"] if isinstance(tool["args"], str)
+                        else json.dumps(tool["args"], separators=(",", ":")),
+                    }
+                    for tool in response["tool_calls_made"]
+                ],
                 "iterations": response["iterations"],
                 "model": response["model"]
             })
+            save_messages()
+
+        # The next fragment-scoped rerun would replace this fragment's
+        # drawn elements, vanishing the exchange while render_history (not
+        # rerun) and the footer count stayed pre-turn; hand the committed
+        # turn to the full script instead.
+        st.rerun(scope="app")
+
+    handle_turn()
+
+    # Footer in its own fragment so its button only reruns this block;
+    # Reset still asks for a full-app rerun to clear the rendered history.
+    @st.fragment
+    def render_footer():
+        st.markdown("---")
+        col1, col2, col3 = st.columns(3)
 
-    # Footer
-    st.markdown("---")
-    col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("Reset Conversation", use_container_width=True):
+                # Only session state to clear: the shared agent holds no
+                # per-session conversation (history is passed per call).
+                st.session_state.messages = []
+                st.session_state.context_start = 0
+                save_messages(force=True)
+                st.rerun(scope="app")
 
-    with col1:
-        if st.button("Reset Conversation", use_container_width=True):
-            st.session_state.messages = []
-            st.session_state.llm_agent.reset_conversation()
-            st.rerun()
+        with col2:
+            st.write(f"Messages: {len(st.session_state.messages)}")
 
-    with col2:
-        st.write(f"Messages: {len(st.session_state.messages)}")
+        with col3:
+            st.write("Portfolio AI Agent v1.0")
 
-    with col3:
-        st.write("Portfolio AI Agent v1.0")
+    render_footer()
 
 
 if __name__ == "__main__":